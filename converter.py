@@ -1,17 +1,23 @@
-from pdf2docx import Converter
+import sys
+import time
 
-# Caminho do arquivo PDF de entrada
-pdf_file = input("Digite o caminho do arquivo PDF: ")
-# Caminho do arquivo Word de saída
-word_file = pdf_file+"convertido.docx"
+from convertido import contar_paginas, main, pdf_para_word
+from utilitarios import imprimir_desempenho
 
-# Criar conversor
-cv = Converter(pdf_file)
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Mesmas opções de convertido.py (processos, partes em paralelo)
+        main()
+    else:
+        # Caminho do arquivo PDF de entrada
+        pdf_file = input("Digite o caminho do arquivo PDF: ")
+        # Caminho do arquivo Word de saída
+        word_file = pdf_file+"convertido.docx"
 
-# Converter todo o conteúdo do PDF para Word
-cv.convert(word_file, start=0, end=None)
+        # Converter todo o conteúdo do PDF para Word
+        inicio = time.perf_counter()
+        pdf_para_word(pdf_file, word_file)
+        duracao = time.perf_counter() - inicio
 
-# Fechar conversor
-cv.close()
-
-print("Conversão concluída com sucesso!")
+        print("Conversão concluída com sucesso!")
+        imprimir_desempenho(contar_paginas(pdf_file), duracao)
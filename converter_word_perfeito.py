@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 import argparse
+import io
+from contextlib import redirect_stdout
 
 try:
     import pdfplumber
@@ -16,11 +18,12 @@ except ImportError as e:
     print("Execute: pip install pdfplumber python-docx")
     sys.exit(1)
 
+from utilitarios import resolver_origem_pdf
+
 class PDFToWordPerfeito:
     def __init__(self, pdf_path):
-        self.pdf_path = Path(pdf_path)
-        if not self.pdf_path.exists():
-            raise FileNotFoundError(f"Arquivo PDF não encontrado: {pdf_path}")
+        """Aceita um caminho, bytes, um objeto de arquivo binário ou '-' para ler da stdin"""
+        self.pdf_path, self.pdf_source, self.pdf_name = resolver_origem_pdf(pdf_path)
     
     def _preserve_spacing(self, text):
         """Preserva espaçamento e formatação do texto"""
@@ -98,7 +101,7 @@ class PDFToWordPerfeito:
         """Extrai conteúdo de forma estruturada"""
         pages_content = []
         
-        with pdfplumber.open(self.pdf_path) as pdf:
+        with pdfplumber.open(self.pdf_source) as pdf:
             for page_num, page in enumerate(pdf.pages, 1):
                 print(f"Processando página {page_num}...")
                 
@@ -177,14 +180,19 @@ class PDFToWordPerfeito:
         return pages_content
     
     def convert_to_word(self, output_path=None):
-        """Converte PDF para Word com máxima fidelidade"""
+        """Converte PDF para Word com máxima fidelidade
+        
+        output_path pode ser um caminho ou um objeto de arquivo binário (ex.: a stdout).
+        """
         if output_path is None:
+            if self.pdf_path is None:
+                raise ValueError("Informe output_path para converter um PDF recebido em memória")
             base_name = self.pdf_path.stem
             output_path = self.pdf_path.parent / f"{base_name}_perfeito.docx"
         
         print(f"🚀 Iniciando conversão perfeita para Word...")
-        print(f"📄 Arquivo origem: {self.pdf_path}")
-        print(f"📄 Arquivo destino: {output_path}")
+        print(f"📄 Arquivo origem: {self.pdf_path or self.pdf_name}")
+        print(f"📄 Arquivo destino: {getattr(output_path, 'name', output_path)}")
         
         # Extrair conteúdo estruturado
         pages_content = self._extract_structured_content()
@@ -203,7 +211,7 @@ class PDFToWordPerfeito:
         # Adicionar título
         title = self._add_formatted_paragraph(
             doc, 
-            f"Conversão de: {self.pdf_path.name}", 
+            f"Conversão de: {self.pdf_name}", 
             font_size=14, 
             bold=True, 
             center=True
@@ -260,29 +268,41 @@ class PDFToWordPerfeito:
                 doc.add_page_break()
         
         # Salvar documento
-        doc.save(output_path)
+        if hasattr(output_path, 'write'):
+            # Gera o .docx em memória: a saída pode não permitir seek (ex.: stdout)
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            output_path.write(buffer.getvalue())
+            output_path.flush()
+        else:
+            doc.save(output_path)
         
         print(f"✅ Conversão concluída com sucesso!")
-        print(f"📄 Arquivo Word salvo em: {output_path}")
+        print(f"📄 Arquivo Word salvo em: {getattr(output_path, 'name', output_path)}")
         
         return output_path
 
 def main():
     parser = argparse.ArgumentParser(description='Conversor PDF para Word Perfeito')
-    parser.add_argument('pdf_file', help='Caminho para o arquivo PDF')
-    parser.add_argument('-o', '--output', help='Caminho do arquivo Word de saída')
+    parser.add_argument('pdf_file', help="Caminho para o arquivo PDF ('-' para ler da stdin)")
+    parser.add_argument('-o', '--output', help="Caminho do arquivo Word de saída ('-' para a stdout)")
     
     args = parser.parse_args()
+
+    # Com saída na stdout, as mensagens de progresso vão para a stderr
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    log_stream = sys.stderr if args.output == '-' else sys.stdout
     
     try:
-        converter = PDFToWordPerfeito(args.pdf_file)
-        output_file = converter.convert_to_word(args.output)
-        
-        print(f"\n🎉 Conversão perfeita concluída!")
-        print(f"📂 Abra o arquivo: {output_file}")
+        with redirect_stdout(log_stream):
+            converter = PDFToWordPerfeito(args.pdf_file)
+            output_file = converter.convert_to_word(output)
+            
+            print(f"\n🎉 Conversão perfeita concluída!")
+            print(f"📂 Abra o arquivo: {getattr(output_file, 'name', output_file)}")
         
     except Exception as e:
-        print(f"❌ Erro durante a conversão: {e}")
+        print(f"❌ Erro durante a conversão: {e}", file=log_stream)
         import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -1,15 +1,153 @@
-from pdf2docx import Converter
-
-def pdf_para_word(pdf_path, word_path):
-    # Criar conversor
-    cv = Converter(pdf_path)
-    
-    # Converter todas as páginas para Word editável
-    cv.convert(word_path, start=0, end=None)
-    
-    # Fechar conversor
-    cv.close()
-    print(f"✅ Arquivo convertido: {word_path}")
-
-# Exemplo de uso
-pdf_para_word("Todos os documentos.pdf", "saida3.docx")
+import os
+import sys
+import time
+import tempfile
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fitz  # PyMuPDF, instalado junto com o pdf2docx
+    from pdf2docx import Converter
+except ImportError as e:
+    print(f"Erro: Biblioteca necessária não encontrada - {e}")
+    print("Execute: pip install pdf2docx")
+    sys.exit(1)
+
+from utilitarios import imprimir_desempenho
+
+# Páginas por parte no modo de conversão em intervalos
+PAGINAS_POR_PARTE = 50
+
+
+def contar_paginas(pdf_path):
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+def dividir_em_intervalos(total_paginas, paginas_por_parte):
+    """Divide [0, total_paginas) em intervalos (start, end) no formato do pdf2docx."""
+    return [
+        (inicio, min(inicio + paginas_por_parte, total_paginas))
+        for inicio in range(0, total_paginas, paginas_por_parte)
+    ]
+
+
+def processos_efetivos(processos):
+    """Número de processos realmente usados: o pdf2docx e o pool não passam do número de núcleos."""
+    return max(1, min(processos, os.cpu_count() or 1))
+
+
+def pdf_para_word(pdf_path, word_path, start=0, end=None, processos=1):
+    """
+    Converte as páginas [start, end) do PDF num único DOCX.
+    Com processos > 1, usa o multiprocessamento do próprio pdf2docx, que
+    divide o intervalo entre os processos e junta o resultado num só arquivo.
+    O pdf2docx grava arquivos intermediários (pages-N.json) no diretório
+    atual; por isso essa conversão roda num diretório temporário próprio.
+    """
+    if processos <= 1:
+        # Criar conversor
+        cv = Converter(str(pdf_path))
+        try:
+            cv.convert(str(word_path), start=start, end=end)
+        finally:
+            # Fechar conversor
+            cv.close()
+        return word_path
+
+    # Caminhos absolutos, pois os subprocessos do pdf2docx reabrem o PDF pelo nome
+    pdf_abs = Path(pdf_path).resolve()
+    word_abs = Path(word_path).resolve()
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='pdf2docx_') as diretorio_trabalho:
+        os.chdir(diretorio_trabalho)
+        try:
+            cv = Converter(str(pdf_abs))
+            try:
+                cv.convert(str(word_abs), start=start, end=end, multi_processing=True, cpu_count=processos)
+            finally:
+                cv.close()
+        finally:
+            os.chdir(diretorio_original)
+    return word_path
+
+
+def _converter_intervalo(pdf_path, word_path, start, end):
+    """Executado em subprocesso: converte um intervalo de páginas num DOCX próprio."""
+    pdf_para_word(pdf_path, word_path, start=start, end=end)
+    return word_path
+
+
+def converter_em_partes(pdf_path, pasta_saida=None, paginas_por_parte=PAGINAS_POR_PARTE, processos=None):
+    """
+    Divide o PDF em intervalos de páginas e converte cada um num DOCX
+    (*_pdf2docx_parte_NN.docx, para não colidir com os lotes do novaconver.py),
+    distribuindo os intervalos entre vários processos.
+    """
+    pdf_path = Path(pdf_path)
+    pasta_saida = Path(pasta_saida) if pasta_saida else pdf_path.parent
+    total_paginas = contar_paginas(pdf_path)
+    intervalos = dividir_em_intervalos(total_paginas, paginas_por_parte)
+
+    saidas = []
+    with ProcessPoolExecutor(max_workers=processos_efetivos(processos or os.cpu_count())) as executor:
+        futuros = [
+            executor.submit(
+                _converter_intervalo,
+                str(pdf_path),
+                str(pasta_saida / f"{pdf_path.stem}_pdf2docx_parte_{num:02d}.docx"),
+                start,
+                end,
+            )
+            for num, (start, end) in enumerate(intervalos, 1)
+        ]
+        for num, ((start, end), futuro) in enumerate(zip(intervalos, futuros), 1):
+            saidas.append(Path(futuro.result()))
+            print(f"✅ Parte {num} (páginas {start + 1} a {end}) salva em: {saidas[-1].name}")
+
+    return saidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Conversor PDF para Word (motor pdf2docx)')
+    parser.add_argument('pdf_file', help='Caminho do arquivo PDF')
+    parser.add_argument('-o', '--output', help='Arquivo DOCX de saída (padrão: <nome>_convertido.docx); com --paginas-por-parte, as partes vão para a pasta deste arquivo')
+    parser.add_argument('-p', '--processos', type=int, default=1, help='Número de processos, limitado ao número de núcleos (padrão: 1)')
+    parser.add_argument('--paginas-por-parte', type=int, help='Divide o documento em partes com este número de páginas, convertidas em paralelo (um DOCX por parte)')
+
+    args = parser.parse_args()
+
+    pdf_path = Path(args.pdf_file)
+    if not pdf_path.exists():
+        print(f"❌ Arquivo PDF não encontrado: {pdf_path}")
+        sys.exit(1)
+    word_path = Path(args.output) if args.output else pdf_path.parent / f"{pdf_path.stem}_convertido.docx"
+
+    processos = processos_efetivos(args.processos)
+    print(f"🚀 Iniciando conversão com pdf2docx usando {processos} processo(s)...")
+    print(f"📄 Arquivo origem: {pdf_path}")
+
+    inicio = time.perf_counter()
+    try:
+        total_paginas = contar_paginas(pdf_path)
+        if args.paginas_por_parte:
+            partes = converter_em_partes(pdf_path, word_path.parent, args.paginas_por_parte, processos)
+            processos_simultaneos = min(processos, len(partes))
+        else:
+            pdf_para_word(pdf_path, word_path, processos=processos)
+            processos_simultaneos = processos
+            print(f"✅ Arquivo convertido: {word_path}")
+    except Exception as e:
+        print(f"❌ Erro durante a conversão: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    duracao = time.perf_counter() - inicio
+
+    print(f"\n🎉 Conversão concluída! {total_paginas} páginas processadas.")
+    imprimir_desempenho(total_paginas, duracao, processos_simultaneos)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import sys
 from pathlib import Path
 import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import time
+import zipfile
+from contextlib import redirect_stdout
 
 # Importações e Classes de Formatação (mantidas as originais)
 try:
     import pdfplumber
+    from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
     from docx import Document
     from docx.shared import Inches, Pt
     from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -17,14 +25,32 @@ except ImportError as e:
     print("Execute: pip install pdfplumber python-docx")
     sys.exit(1)
 
+from utilitarios import imprimir_desempenho, resolver_origem_pdf
+
+try:
+    import resource  # Limite de memória do modo isolado (indisponível no Windows)
+except ImportError:
+    resource = None
+
 # Defina o tamanho do lote de conversão
 TAMANHO_DO_LOTE = 50
 
+# Versão do formato do manifesto usado na conversão incremental
+VERSAO_MANIFESTO = 2
+
+# Limites do modo isolado: cada página é extraída num subprocesso e, se estourar
+# o tempo ou a memória, é refeita com uma estratégia mais barata (na ordem abaixo).
+# Estourar o tempo leva direto ao último modo, e cada nova tentativa tem metade
+# do tempo da anterior; o orçamento opcional do documento limita a soma de todas elas.
+LIMITE_TEMPO_PAGINA = 60         # segundos da primeira tentativa
+LIMITE_MEMORIA_PAGINA_MB = 2048  # memória total do subprocesso
+LIMITE_TEMPO_DOCUMENTO = None    # segundos para o documento inteiro (None = sem limite)
+MODOS_EXTRACAO = ['completo', 'sem_lines_strict', 'somente_texto']
+
 class PDFToWordPerfeito:
     def __init__(self, pdf_path):
-        self.pdf_path = Path(pdf_path)
-        if not self.pdf_path.exists():
-            raise FileNotFoundError(f"Arquivo PDF não encontrado: {pdf_path}")
+        """Aceita um caminho, bytes, um objeto de arquivo binário ou '-' para ler da stdin."""
+        self.pdf_path, self.pdf_source, self.pdf_name = resolver_origem_pdf(pdf_path)
         
     # --- Métodos Auxiliares de Formatação (Mantidos) ---
     def _preserve_spacing(self, text):
@@ -73,14 +99,105 @@ class PDFToWordPerfeito:
             for cell in column.cells:
                 cell.width = Inches(1.5)
 
-    def _extract_page_content(self, page, page_num):
-        """Extrai conteúdo estruturado de uma ÚNICA página."""
+    # --- Métodos da Conversão Incremental ---
+    def _hash_pdf_object(self, obj, hasher, seen):
+        """Alimenta o hash com um objeto PDF, resolvendo referências recursivamente."""
+        if isinstance(obj, PDFObjRef):
+            if obj.objid in seen:
+                hasher.update(f"ref:{obj.objid};".encode())
+                return
+            seen.add(obj.objid)
+            obj = resolve1(obj)
+
+        if isinstance(obj, PDFStream):
+            hasher.update(b"stream:")
+            self._hash_pdf_object(obj.attrs, hasher, seen)
+            # Os dados brutos bastam para detectar mudanças e evitam decodificar imagens
+            data = obj.get_rawdata()
+            hasher.update(data if data is not None else obj.get_data())
+        elif isinstance(obj, dict):
+            hasher.update(b"dict:")
+            for key in sorted(obj, key=str):
+                hasher.update(f"{key}=".encode())
+                self._hash_pdf_object(obj[key], hasher, seen)
+        elif isinstance(obj, (list, tuple)):
+            hasher.update(b"list:")
+            for item in obj:
+                self._hash_pdf_object(item, hasher, seen)
+        elif isinstance(obj, bytes):
+            hasher.update(obj)
+        else:
+            hasher.update(repr(obj).encode())
+        hasher.update(b";")
+
+    def _page_hash(self, page):
+        """Calcula o hash do fluxo de conteúdo, recursos e geometria de uma página."""
+        page_obj = page.page_obj
+        hasher = hashlib.sha256()
+        seen = set()
+        self._hash_pdf_object([page_obj.mediabox, page_obj.cropbox, page_obj.rotate], hasher, seen)
+        self._hash_pdf_object(page_obj.contents, hasher, seen)
+        self._hash_pdf_object(page_obj.resources, hasher, seen)
+        return hasher.hexdigest()
+
+    def _manifest_path(self):
+        return self.pdf_path.parent / f"{self.pdf_path.stem}_manifesto.json"
+
+    def _docx_bytes(self, doc):
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    def _load_manifest(self):
+        """Carrega o manifesto da conversão anterior; retorna None se inválido ou ausente."""
+        manifest_path = self._manifest_path()
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Manifesto ignorado ({manifest_path.name}): {e}")
+            return None
+        if manifest.get('versao') != VERSAO_MANIFESTO:
+            return None
+        return manifest
+
+    def _file_hash(self, path):
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def _save_manifest(self, page_hashes, page_contents, lot_hashes):
+        # Páginas degradadas pelo modo isolado ficam sem hash, para serem
+        # reextraídas na próxima conversão (com outros limites ou sem isolamento).
+        # O hash de cada lote salvo permite reconhecer depois um arquivo que
+        # foi sobrescrito ou não foi gerado por esta conversão.
+        manifest = {
+            'versao': VERSAO_MANIFESTO,
+            'tamanho_do_lote': TAMANHO_DO_LOTE,
+            'lotes': lot_hashes,
+            'paginas': [
+                {'hash': None if content.get('degradacao') else page_hash, 'conteudo': content}
+                for page_hash, content in zip(page_hashes, page_contents)
+            ],
+        }
+        manifest_path = self._manifest_path()
+        tmp_path = manifest_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+        tmp_path.replace(manifest_path)
+
+    def _extract_page_content(self, page, page_num, mode='completo'):
+        """Extrai conteúdo estruturado de uma ÚNICA página.
+
+        mode (ver MODOS_EXTRACAO) permite pular estratégias caras de tabela:
+        'sem_lines_strict' não tenta lines_strict e 'somente_texto' não extrai tabelas.
+        """
         page_content = {
             'page_num': page_num,
             'text_blocks': [],
             'tables': [],
             'layout_preserved': False
         }
+        if mode != 'completo':
+            page_content['degradacao'] = mode
         
         # --- LÓGICA DE EXTRAÇÃO DE TABELAS ---
         # Tenta várias estratégias para extrair tabelas
@@ -90,6 +207,10 @@ class PDFToWordPerfeito:
             {"vertical_strategy": "text", "horizontal_strategy": "text", "snap_tolerance": 3, "join_tolerance": 3},
             {} # Padrão
         ]
+        if mode == 'sem_lines_strict':
+            table_settings = table_settings[1:]
+        elif mode == 'somente_texto':
+            table_settings = []
         
         tables = []
         for settings in table_settings:
@@ -126,6 +247,118 @@ class PDFToWordPerfeito:
                 
         return page_content
 
+    # --- Métodos do Modo Isolado ---
+    def _worker_source(self):
+        """Origem do PDF que pode ser enviada ao subprocesso (caminho ou bytes)."""
+        if self.pdf_path is not None:
+            return self.pdf_path
+        position = self.pdf_source.tell()
+        self.pdf_source.seek(0)
+        data = self.pdf_source.read()
+        self.pdf_source.seek(position)
+        return data
+
+    def _start_worker(self, limit):
+        """Inicia o subprocesso e espera ele abrir o PDF; retorna (status, detalhe)."""
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._worker = multiprocessing.Process(
+            target=_isolated_page_worker,
+            args=(child_conn, self._worker_pdf, self._page_memory_mb),
+            daemon=True
+        )
+        self._worker.start()
+        child_conn.close()
+        self._worker_conn = parent_conn
+
+        # O subprocesso só responde depois de abrir o PDF, para que a abertura
+        # não consuma o limite de tempo da primeira página
+        if not self._worker_conn.poll(limit):
+            return 'tempo', f'abertura do PDF excedeu {limit:.0f}s'
+        try:
+            status, payload = self._worker_conn.recv()
+        except EOFError:
+            return 'erro', 'subprocesso encerrado ao abrir o PDF'
+        if status != 'pronto':
+            return status, payload
+
+        # Na resposta de pronto vem o aviso caso o limite de memória não tenha sido aplicado
+        if payload and not self._memory_warning_shown:
+            print(f"  ⚠️ Limite de memória não aplicado: {payload}. Só o limite de tempo vale.")
+            self._memory_warning_shown = True
+        return status, None
+
+    def _stop_worker(self, kill=False):
+        if self._worker is None:
+            return
+        if kill:
+            self._worker.kill()
+        else:
+            try:
+                self._worker_conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self._worker.join()
+        self._worker_conn.close()
+        self._worker = None
+        self._worker_conn = None
+
+    def _extract_page_isolated(self, page_index, page_num):
+        """Extrai a página num subprocesso, degradando a estratégia a cada limite estourado."""
+        timeout = self._page_timeout
+        modes = list(MODOS_EXTRACAO)
+        payload = None
+        while modes:
+            mode = modes.pop(0)
+            limit = timeout
+            if self._deadline is not None:
+                limit = min(limit, self._deadline - time.perf_counter())
+                if limit <= 0:
+                    return self._empty_page_content(page_num, 'orcamento_esgotado')
+
+            status = 'pronto'
+            if self._worker is None:
+                status, payload = self._start_worker(limit)
+
+            if status == 'pronto':
+                try:
+                    self._worker_conn.send((page_index, page_num, mode))
+                except (BrokenPipeError, OSError):
+                    pass
+
+                if self._worker_conn.poll(limit):
+                    try:
+                        status, payload = self._worker_conn.recv()
+                    except EOFError:
+                        status, payload = 'erro', 'subprocesso encerrado'
+                else:
+                    status, payload = 'tempo', f'tempo limite de {limit:.0f}s excedido'
+
+            if status == 'ok':
+                return payload
+
+            # O subprocesso pode estar travado ou sem memória: descarta e recomeça
+            self._stop_worker(kill=True)
+            print(f"  ⚠️ Página {page_num}: modo '{mode}' falhou ({payload}).")
+
+            # Páginas lentas o são no parse do layout, que todos os modos fazem:
+            # só vale tentar mais uma vez, no modo mais barato
+            if status == 'tempo':
+                modes = modes[-1:]
+            timeout /= 2
+
+        # Guarda a causa da última tentativa: tempo, memória ou erro do pdfplumber
+        return self._empty_page_content(page_num, 'falhou', motivo=payload)
+
+    def _empty_page_content(self, page_num, degradacao, motivo=None):
+        return {
+            'page_num': page_num,
+            'text_blocks': [],
+            'tables': [],
+            'layout_preserved': False,
+            'degradacao': degradacao,
+            'motivo': motivo
+        }
+
     def _process_page_content(self, doc, page_content, is_first_page_in_batch=False):
         """Processa o conteúdo de uma única página e adiciona ao docx"""
         page_num = page_content['page_num']
@@ -143,6 +376,17 @@ class PDFToWordPerfeito:
             center=True
         )
         doc.add_paragraph()
+
+        # Registrar no documento quando a página foi extraída em modo degradado
+        degradacao = page_content.get('degradacao')
+        if degradacao:
+            if degradacao == 'falhou':
+                aviso = f"extração falhou ({page_content.get('motivo') or 'motivo desconhecido'})"
+            elif degradacao == 'orcamento_esgotado':
+                aviso = "página não extraída: orçamento de tempo do documento esgotado"
+            else:
+                aviso = f"extração degradada ({degradacao})"
+            self._add_formatted_paragraph(doc, f"[AVISO: {aviso}]", font_size=9)
         
         # Adicionar tabelas primeiro
         if page_content['tables']:
@@ -170,19 +414,99 @@ class PDFToWordPerfeito:
                     
                     doc.add_paragraph()
 
-    def convert_to_word(self, output_path=None):
-        """Converte PDF para Word em lotes de 50 páginas, extraindo página a página."""
+    def convert_to_word(self, output_path=None, incremental=False, isolate=False,
+                        page_timeout=LIMITE_TEMPO_PAGINA, page_memory_mb=LIMITE_MEMORIA_PAGINA_MB,
+                        document_budget=LIMITE_TEMPO_DOCUMENTO):
+        """Converte PDF para Word em lotes de 50 páginas, extraindo página a página.
+
+        Sem output_path, cada lote é salvo ao lado do PDF (*_parte_NN.docx).
+        Com output_path (caminho ou objeto de arquivo binário, como a stdout),
+        tudo é escrito nele como um ZIP gerado em fluxo com as partes, mesmo
+        que haja um único lote, para que o formato da saída seja sempre o mesmo.
+
+        No modo incremental, compara o hash de cada página com o manifesto da
+        conversão anterior: só páginas alteradas ou novas são reextraídas, e
+        lotes sem nenhuma alteração não são regravados.
+
+        No modo isolado (isolate=True), cada página é extraída num subprocesso
+        limitado a page_timeout segundos e page_memory_mb MB; ao estourar um
+        limite, a página é refeita com uma estratégia mais barata e a
+        degradação é registrada no documento. document_budget (segundos)
+        limita o tempo total de extração; esgotado, as páginas restantes
+        ficam sem conteúdo, marcadas como 'orcamento_esgotado', e a conversão
+        retorna False (os lotes são salvos mesmo assim).
+        """
+        if output_path is None and self.pdf_path is None:
+            raise ValueError("Informe output_path para converter um PDF recebido em memória.")
+        if incremental and output_path is not None:
+            print("⚠️ Modo incremental disponível apenas com saída em lotes ao lado do PDF; ignorado.")
+            incremental = False
         
         print(f"🚀 Iniciando conversão perfeita para Word em lotes de {TAMANHO_DO_LOTE} páginas...")
-        print(f"📄 Arquivo origem: {self.pdf_path}")
+        print(f"📄 Arquivo origem: {self.pdf_path or self.pdf_name}")
         
-        base_name = self.pdf_path.stem
+        base_name = Path(self.pdf_name).stem
         total_pages = 0
         lote_num = 0
+        inicio = time.perf_counter()
+
+        # Destino em fluxo (ZIP num arquivo ou objeto de arquivo) em vez dos lotes em disco
+        stream_out = None
+        owns_stream = False
+        zip_out = None
+        if output_path is not None:
+            if hasattr(output_path, 'write'):
+                stream_out = output_path
+            else:
+                stream_out = open(output_path, 'wb')
+                owns_stream = True
+
+        # Estado da conversão incremental
+        previous_hashes = []
+        cached_contents = {}
+        lot_size_unchanged = False
+        previous_lot_hashes = {}
+        if incremental:
+            manifest = self._load_manifest()
+            if manifest:
+                previous_hashes = [entry['hash'] for entry in manifest['paginas']]
+                cached_contents = {
+                    entry['hash']: entry['conteudo']
+                    for entry in manifest['paginas']
+                    if entry['hash'] is not None
+                }
+                lot_size_unchanged = manifest.get('tamanho_do_lote') == TAMANHO_DO_LOTE
+                previous_lot_hashes = manifest.get('lotes', {})
+                print(f"♻️ Manifesto anterior encontrado: {len(previous_hashes)} página(s) registradas.")
+            else:
+                print("♻️ Nenhum manifesto anterior válido: todas as páginas serão extraídas.")
+        page_hashes = []
+        page_contents = []
+        saved_lot_hashes = {}
+
+        # Estado do modo isolado
+        self._worker = None
+        self._worker_conn = None
+        degraded_pages = []
+        if isolate:
+            self._worker_pdf = self._worker_source()
+            self._page_timeout = page_timeout
+            self._page_memory_mb = page_memory_mb
+            self._deadline = time.perf_counter() + document_budget if document_budget else None
+            self._memory_warning_shown = False
+            print(f"🛡️ Modo isolado: limite de {page_timeout}s e {page_memory_mb} MB por página.")
+            if document_budget:
+                print(f"🛡️ Orçamento de tempo do documento: {document_budget}s.")
+        pages_reused = 0
+        pages_extracted = 0
+        lots_kept = 0
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
+            with pdfplumber.open(self.pdf_source) as pdf:
                 total_pages = len(pdf.pages)
+
+                if stream_out is not None:
+                    zip_out = zipfile.ZipFile(stream_out, 'w', zipfile.ZIP_DEFLATED)
                 
                 # Loop para processar e salvar em lotes
                 for start_index in range(0, total_pages, TAMANHO_DO_LOTE):
@@ -190,7 +514,24 @@ class PDFToWordPerfeito:
                     lote_num += 1
                     
                     # Define o nome do arquivo de saída para o lote
-                    output_file_lote = self.pdf_path.parent / f"{base_name}_parte_{lote_num:02d}.docx"
+                    nome_lote = f"{base_name}_parte_{lote_num:02d}.docx"
+                    output_file_lote = self.pdf_path.parent / nome_lote if stream_out is None else None
+
+                    if incremental:
+                        lot_hashes = [self._page_hash(pdf.pages[i]) for i in range(start_index, end_index)]
+                        page_hashes.extend(lot_hashes)
+
+                        # Lote idêntico ao anterior e o arquivo é o que foi salvo: nada a refazer
+                        if (lot_size_unchanged
+                                and previous_hashes[start_index:end_index] == lot_hashes
+                                and output_file_lote.exists()
+                                and previous_lot_hashes.get(nome_lote) == self._file_hash(output_file_lote)):
+                            saved_lot_hashes[nome_lote] = previous_lot_hashes[nome_lote]
+                            page_contents.extend(cached_contents[h] for h in lot_hashes)
+                            pages_reused += len(lot_hashes)
+                            lots_kept += 1
+                            print(f"\n⏭️ LOTE {lote_num} sem alterações (páginas {start_index + 1} a {end_index}), mantido: {output_file_lote.name}")
+                            continue
                     
                     doc = Document()
                     print(f"\n📂 Processando LOTE {lote_num}: Páginas {start_index + 1} a {end_index}...")
@@ -205,7 +546,7 @@ class PDFToWordPerfeito:
                     # Adicionar título no início de cada documento
                     self._add_formatted_paragraph(
                         doc, 
-                        f"Conversão de: {self.pdf_path.name} (Parte {lote_num})", 
+                        f"Conversão de: {self.pdf_name} (Parte {lote_num})", 
                         font_size=14, 
                         bold=True, 
                         center=True
@@ -217,10 +558,29 @@ class PDFToWordPerfeito:
                         page_num_real = page_index + 1
                         page = pdf.pages[page_index]
                         
-                        print(f"  -> Extraindo e processando página {page_num_real} de {total_pages}...")
-                        
-                        # Extrai o conteúdo da página atual
-                        page_content = self._extract_page_content(page, page_num_real)
+                        cached = cached_contents.get(page_hashes[page_index]) if incremental else None
+                        if cached is not None:
+                            # Página inalterada (mesmo que tenha mudado de posição)
+                            page_content = dict(cached, page_num=page_num_real)
+                            pages_reused += 1
+                        else:
+                            print(f"  -> Extraindo e processando página {page_num_real} de {total_pages}...")
+                            
+                            # Extrai o conteúdo da página atual
+                            if isolate:
+                                page_content = self._extract_page_isolated(page_index, page_num_real)
+                            else:
+                                page_content = self._extract_page_content(page, page_num_real)
+                            pages_extracted += 1
+
+                        if page_content.get('degradacao'):
+                            degradacao = page_content['degradacao']
+                            if page_content.get('motivo'):
+                                degradacao = f"{degradacao}: {page_content['motivo']}"
+                            degraded_pages.append((page_num_real, degradacao))
+
+                        if incremental:
+                            page_contents.append(page_content)
                         
                         is_first = (page_index == start_index)
                         
@@ -228,11 +588,43 @@ class PDFToWordPerfeito:
                         self._process_page_content(doc, page_content, is_first_page_in_batch=is_first)
                     
                     # Salvar documento do lote
-                    doc.save(output_file_lote)
-                    print(f"✅ Lote {lote_num} concluído e salvo em: {output_file_lote.name}")
+                    if zip_out is not None:
+                        zip_out.writestr(nome_lote, self._docx_bytes(doc))
+                        print(f"✅ Lote {lote_num} concluído e adicionado ao ZIP como: {nome_lote}")
+                    else:
+                        lot_data = self._docx_bytes(doc)
+                        output_file_lote.write_bytes(lot_data)
+                        saved_lot_hashes[nome_lote] = hashlib.sha256(lot_data).hexdigest()
+                        print(f"✅ Lote {lote_num} concluído e salvo em: {output_file_lote.name}")
+
+            if zip_out is not None:
+                zip_out.close()
+            if stream_out is not None:
+                stream_out.flush()
+
+            if incremental:
+                self._save_manifest(page_hashes, page_contents, saved_lot_hashes)
+                print(f"\n♻️ Incremental: {pages_extracted} página(s) reextraída(s), {pages_reused} reaproveitada(s), {lots_kept} lote(s) mantido(s).")
+
+            # Páginas sem conteúdo por falta de orçamento são contadas à parte
+            skipped_pages = sum(1 for _, degradacao in degraded_pages if degradacao == 'orcamento_esgotado')
+            degraded_pages = [item for item in degraded_pages if item[1] != 'orcamento_esgotado']
+            if degraded_pages:
+                print(f"\n⚠️ {len(degraded_pages)} página(s) convertida(s) em modo degradado:")
+                for page_num, degradacao in degraded_pages:
+                    print(f"  -> Página {page_num}: {degradacao}")
             
-            print(f"\n🎉 Conversão em lotes concluída! Total de {total_pages} páginas processadas.")
-            return True
+            # Encerra o subprocesso antes de medir, para que entre no pico de memória
+            if isolate:
+                self._stop_worker()
+            duracao = time.perf_counter() - inicio
+            processed_pages = total_pages - skipped_pages
+            if skipped_pages:
+                print(f"\n❌ Orçamento de tempo do documento esgotado: {skipped_pages} de {total_pages} página(s) ficaram sem conteúdo.")
+            else:
+                print(f"\n🎉 Conversão em lotes concluída! Total de {total_pages} páginas processadas.")
+            imprimir_desempenho(processed_pages, duracao, processos=2 if isolate and pages_extracted else 1)
+            return not skipped_pages
 
         except Exception as e:
             print(f"❌ Erro fatal durante a conversão do lote {lote_num}: {e}")
@@ -240,35 +632,102 @@ class PDFToWordPerfeito:
             traceback.print_exc()
             return False
 
+        finally:
+            if isolate:
+                self._stop_worker()
+            if owns_stream:
+                stream_out.close()
+
+
+def _isolated_page_worker(conn, pdf_source, page_memory_mb):
+    """Subprocesso do modo isolado: extrai as páginas pedidas pelo processo principal."""
+    memory_warning = None
+    if page_memory_mb:
+        if resource is None:
+            memory_warning = "módulo resource indisponível nesta plataforma"
+        else:
+            limit = page_memory_mb * 1024 * 1024
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            except (ValueError, OSError) as e:
+                memory_warning = f"setrlimit(RLIMIT_AS) falhou: {e}"
+
+    # Abre o PDF e carrega a lista de páginas antes de se declarar pronto
+    try:
+        converter = PDFToWordPerfeito(pdf_source)
+        pdf = pdfplumber.open(converter.pdf_source)
+        pdf.pages
+    except MemoryError:
+        conn.send(('erro', f'limite de {page_memory_mb} MB excedido ao abrir o PDF'))
+        return
+    except Exception as e:
+        conn.send(('erro', f'falha ao abrir o PDF: {e}'))
+        return
+    conn.send(('pronto', memory_warning))
+
+    with pdf:
+        while True:
+            request = conn.recv()
+            if request is None:
+                break
+            page_index, page_num, mode = request
+            page = pdf.pages[page_index]
+            try:
+                conn.send(('ok', converter._extract_page_content(page, page_num, mode)))
+            except MemoryError:
+                conn.send(('erro', f'limite de {page_memory_mb} MB excedido'))
+            except Exception as e:
+                conn.send(('erro', str(e)))
+            finally:
+                page.close()
+
 
 def main():
     parser = argparse.ArgumentParser(description='Conversor PDF para Word Perfeito')
-    parser.add_argument('pdf_file', nargs='?', default=None, help='Caminho/Nome do arquivo PDF')
-    parser.add_argument('-o', '--output', help='Caminho do arquivo Word de saída (Ignorado no modo Lote)')
+    parser.add_argument('pdf_file', nargs='?', default=None, help="Caminho/Nome do arquivo PDF ('-' para ler da stdin)")
+    parser.add_argument('-o', '--output', help="Arquivo de saída ('-' para a stdout); é sempre gerado um ZIP com as partes, mesmo com um único lote. Sem -o, os lotes são salvos ao lado do PDF")
+    parser.add_argument('-i', '--incremental', action='store_true', help='Reconverte apenas as páginas alteradas desde a última conversão (usa o manifesto *_manifesto.json)')
+    parser.add_argument('--isolar', action='store_true', help='Extrai cada página num subprocesso com limites de tempo e memória, degradando a extração de páginas patológicas')
+    parser.add_argument('--limite-tempo', type=float, default=LIMITE_TEMPO_PAGINA, help=f'Segundos da primeira tentativa de extração de cada página no modo isolado; as seguintes têm a metade (padrão: {LIMITE_TEMPO_PAGINA})')
+    parser.add_argument('--limite-documento', type=float, default=LIMITE_TEMPO_DOCUMENTO, help='Segundos para extrair o documento inteiro no modo isolado; esgotado, as páginas restantes ficam vazias e o programa termina com erro (padrão: sem limite)')
+    parser.add_argument('--limite-memoria', type=int, default=LIMITE_MEMORIA_PAGINA_MB, help=f'Memória máxima (MB) do subprocesso no modo isolado (padrão: {LIMITE_MEMORIA_PAGINA_MB})')
     
     args = parser.parse_args()
+
+    # Com saída na stdout, as mensagens de progresso vão para a stderr
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    log_stream = sys.stderr if args.output == '-' else sys.stdout
+    isolation = {
+        'isolate': args.isolar,
+        'page_timeout': args.limite_tempo,
+        'page_memory_mb': args.limite_memoria,
+        'document_budget': args.limite_documento,
+    }
     
     try:
-        if args.pdf_file:
-            pdf_path = Path(args.pdf_file)
-            if not pdf_path.is_absolute():
-                pdf_path = Path.cwd() / args.pdf_file
-            
-            converter = PDFToWordPerfeito(pdf_path)
-            converter.convert_to_word(args.output)
-            
-        else:
-            pdf_files = list(Path('.').glob('*.pdf'))
-            if pdf_files:
-                print(f"📄 Convertendo o primeiro PDF encontrado: {pdf_files[0].name}")
-                converter = PDFToWordPerfeito(pdf_files[0])
-                converter.convert_to_word()
+        with redirect_stdout(log_stream):
+            if args.pdf_file:
+                pdf_path = args.pdf_file
+                if pdf_path != '-' and not Path(pdf_path).is_absolute():
+                    pdf_path = Path.cwd() / args.pdf_file
+                
+                converter = PDFToWordPerfeito(pdf_path)
+                if not converter.convert_to_word(output, incremental=args.incremental, **isolation):
+                    sys.exit(1)
+                
             else:
-                print("❌ Nenhum arquivo PDF encontrado na pasta atual.")
-                print("💡 Use: python seu_script.py 'nome_do_arquivo.pdf'")
+                pdf_files = list(Path('.').glob('*.pdf'))
+                if pdf_files:
+                    print(f"📄 Convertendo o primeiro PDF encontrado: {pdf_files[0].name}")
+                    converter = PDFToWordPerfeito(pdf_files[0])
+                    if not converter.convert_to_word(output, incremental=args.incremental, **isolation):
+                        sys.exit(1)
+                else:
+                    print("❌ Nenhum arquivo PDF encontrado na pasta atual.")
+                    print("💡 Use: python seu_script.py 'nome_do_arquivo.pdf'")
 
     except Exception as e:
-        print(f"❌ Erro durante a inicialização: {e}")
+        print(f"❌ Erro durante a inicialização: {e}", file=log_stream)
         import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -1,10 +1,18 @@
 import os
 import sys
+import io
+import shutil
+import tempfile
+import time
+import zipfile
+from contextlib import redirect_stdout
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH 
-from pdf2image import convert_from_path 
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pytesseract                     
+from pytesseract import Output
+from utilitarios import imprimir_desempenho, resolver_origem_pdf
 
 # --- CONFIGURAÇÕES CRÍTICAS DO TESSERACT PARA SEU AMBIENTE macOS ---
 # Estes caminhos foram verificados no seu sistema (Homebrew).
@@ -15,27 +23,114 @@ IDIOMA_OCR = 'por'
 # Define o tamanho do lote de páginas para cada arquivo DOCX
 TAMANHO_DO_LOTE = 50 
 
-def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf):
+# --- OCR COM RESOLUÇÃO ADAPTATIVA ---
+# Todas as páginas são renderizadas primeiro em DPI_BAIXO; só as páginas cuja
+# confiança média ou quantidade de palavras fica abaixo dos limites são
+# renderizadas de novo em DPI_ALTO e reprocessadas.
+DPI_BAIXO = 150
+DPI_ALTO = 300
+CONFIANCA_MINIMA = 70   # Confiança média (0-100) das palavras reconhecidas
+MIN_PALAVRAS = 5        # Abaixo disso a página é considerada mal reconhecida
+MAX_TINTA_EM_BRANCO = 0.001  # Fração de pixels escuros abaixo da qual a página é tida como em branco
+
+def ocr_com_confianca(imagem, tesseract_config):
+    """
+    Aplica OCR via image_to_data e retorna (texto, confiança média, nº de palavras).
+    O texto é remontado respeitando blocos, parágrafos e linhas do Tesseract.
+    """
+    dados = pytesseract.image_to_data(
+        imagem,
+        lang=IDIOMA_OCR,
+        config=tesseract_config,
+        output_type=Output.DICT
+    )
+
+    linhas = {}
+    confiancas = []
+    for i, palavra in enumerate(dados['text']):
+        confianca = float(dados['conf'][i])
+        if confianca < 0 or not palavra.strip():
+            continue
+        confiancas.append(confianca)
+        chave = (dados['block_num'][i], dados['par_num'][i], dados['line_num'][i])
+        linhas.setdefault(chave, []).append(palavra)
+
+    # Linhas do mesmo parágrafo ficam juntas; parágrafos separados por linha em branco
+    paragrafos = []
+    paragrafo_anterior = None
+    for (bloco, paragrafo, _linha), palavras in linhas.items():
+        if paragrafo_anterior is not None and (bloco, paragrafo) != paragrafo_anterior:
+            paragrafos.append("")
+        paragrafos.append(" ".join(palavras))
+        paragrafo_anterior = (bloco, paragrafo)
+
+    confianca_media = sum(confiancas) / len(confiancas) if confiancas else 0.0
+    return "\n".join(paragrafos), confianca_media, len(confiancas)
+
+
+def pagina_em_branco(imagem):
+    """Indica se a imagem da página praticamente não tem tinta (pixels escuros)."""
+    histograma = imagem.convert('L').histogram()
+    pixels_escuros = sum(histograma[:128])
+    return pixels_escuros / (imagem.width * imagem.height) < MAX_TINTA_EM_BRANCO
+
+
+def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf, saida=None):
     """
     Converte um PDF baseado em imagem para DOCX usando OCR em lotes,
     passando os caminhos de configuração diretamente ao pytesseract.
+
+    nome_arquivo_pdf pode ser um nome de arquivo, bytes, um objeto de arquivo
+    binário ou '-' (stdin). Sem saida, cada lote é salvo como *_OCR_parte_NN.docx;
+    com saida (caminho ou objeto de arquivo, como a stdout), é escrito nela um
+    ZIP gerado em fluxo com as partes, mesmo que haja um único lote.
+
+    Retorna True se a conversão foi concluída e False em caso de erro.
     """
     
-    # Define caminhos
+    # Define a origem do PDF (nomes de arquivo são relativos à pasta do script)
     diretorio_atual = os.path.dirname(os.path.abspath(__file__))
-    caminho_pdf = os.path.join(diretorio_atual, nome_arquivo_pdf)
-
-    if not os.path.exists(caminho_pdf):
-        print(f"\nERRO: Arquivo PDF não encontrado em: {caminho_pdf}")
-        return
-
-    nome_base = os.path.splitext(os.path.basename(caminho_pdf))[0]
+    origem = nome_arquivo_pdf
+    em_memoria = origem == '-' or not isinstance(origem, (str, os.PathLike))
+    # Verificado antes de ler a stdin, que não poderia ser lida de novo
+    if em_memoria and saida is None:
+        print("\nERRO: Informe a saída para converter um PDF recebido em memória ou pela stdin.")
+        return False
+    if not em_memoria:
+        origem = os.path.join(diretorio_atual, origem)
+    try:
+        caminho_pdf, fonte_pdf, nome_pdf = resolver_origem_pdf(origem)
+    except FileNotFoundError:
+        print(f"\nERRO: Arquivo PDF não encontrado em: {origem}")
+        return False
+    nome_base = os.path.splitext(nome_pdf)[0]
     caminho_saida_base = os.path.join(diretorio_atual, nome_base)
 
+    arquivo_temporario = None
+    fluxo_saida = None
+    fechar_saida = False
+    zip_saida = None
+
+    inicio = time.perf_counter()
     print(f"\n🚀 Iniciando conversão via OCR (Tesseract) em lotes de {TAMANHO_DO_LOTE} páginas...")
     print("ATENÇÃO: Este processo é mais lento, mas necessário para PDFs baseados em imagem.")
     
     try:
+        # O Poppler só lê arquivos: um PDF em memória é gravado uma única vez num
+        # arquivo temporário, reutilizado por todos os lotes e reprocessamentos
+        if caminho_pdf is None:
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as arquivo_temporario:
+                shutil.copyfileobj(fonte_pdf, arquivo_temporario)
+            caminho_pdf = arquivo_temporario.name
+
+        # Destino em fluxo (ZIP num arquivo ou objeto de arquivo) em vez dos lotes em disco
+        if saida is not None:
+            if hasattr(saida, 'write'):
+                fluxo_saida = saida
+            else:
+                fluxo_saida = open(saida, 'wb')
+                fechar_saida = True
+
         # **CORREÇÃO DEFINITIVA:**
         # 1. Define o caminho do executável do Tesseract.
         pytesseract.pytesseract.tesseract_cmd = TESSERACT_EXECUTABLE_MAC
@@ -44,11 +139,13 @@ def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf):
         #    forçando o Tesseract a procurar os dados no local correto.
         tesseract_config = f'--tessdata-dir "{TESSDATA_PREFIX_MAC}"'
         
-        # 1. Converte o PDF inteiro em uma lista de objetos imagem
-        print("\nConvertendo PDF para imagens (Requer Poppler instalado)...")
-        pages_images = convert_from_path(caminho_pdf)
-        total_paginas = len(pages_images)
+        # 1. Obtém o total de páginas; as imagens são renderizadas lote a lote
+        print(f"\nConvertendo PDF para imagens em {DPI_BAIXO} DPI (Requer Poppler instalado)...")
+        total_paginas = pdfinfo_from_path(caminho_pdf)["Pages"]
+        if fluxo_saida is not None:
+            zip_saida = zipfile.ZipFile(fluxo_saida, 'w', zipfile.ZIP_DEFLATED)
         lote_atual = 1
+        paginas_reprocessadas = 0
         
         # 2. Processamento em lotes
         for inicio_pagina in range(0, total_paginas, TAMANHO_DO_LOTE):
@@ -58,6 +155,12 @@ def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf):
             documento_word = Document()
             
             print(f"\n📂 Processando LOTE {lote_atual}: Páginas {inicio_pagina+1} a {fim_pagina} via OCR...")
+            imagens_lote = convert_from_path(
+                caminho_pdf,
+                dpi=DPI_BAIXO,
+                first_page=inicio_pagina + 1,
+                last_page=fim_pagina
+            )
 
             # Configurar margens
             for section in documento_word.sections:
@@ -73,14 +176,27 @@ def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf):
                 if num_pagina > inicio_pagina:
                     documento_word.add_page_break()
                     
-                imagem_pagina = pages_images[num_pagina]
+                imagem_pagina = imagens_lote[num_pagina - inicio_pagina]
+                
+                # Realiza o OCR em baixa resolução, passando a configuração customizada (caminho dos dados)
+                texto_pagina, confianca, palavras = ocr_com_confianca(imagem_pagina, tesseract_config)
                 
-                # Realiza o OCR, passando a configuração customizada (caminho dos dados)
-                texto_pagina = pytesseract.image_to_string(
-                    imagem_pagina, 
-                    lang=IDIOMA_OCR,
-                    config=tesseract_config
-                )
+                # Reprocessa em alta resolução apenas se o reconhecimento foi fraco
+                # (páginas em branco não têm o que melhorar e ficam de fora)
+                reconhecimento_fraco = confianca < CONFIANCA_MINIMA or palavras < MIN_PALAVRAS
+                if reconhecimento_fraco and not (palavras == 0 and pagina_em_branco(imagem_pagina)):
+                    print(f"   Página {num_pagina+1}: confiança {confianca:.0f}, {palavras} palavra(s) em {DPI_BAIXO} DPI; reprocessando em {DPI_ALTO} DPI...")
+                    imagem_pagina = convert_from_path(
+                        caminho_pdf,
+                        dpi=DPI_ALTO,
+                        first_page=num_pagina + 1,
+                        last_page=num_pagina + 1
+                    )[0]
+                    resultado_alto = ocr_com_confianca(imagem_pagina, tesseract_config)
+                    # Mantém a passagem de maior confiança média
+                    if resultado_alto[1] >= confianca:
+                        texto_pagina, confianca, palavras = resultado_alto
+                    paginas_reprocessadas += 1
                 
                 # Adiciona cabeçalho da página
                 paragrafo_cabecalho = documento_word.add_paragraph()
@@ -90,35 +206,72 @@ def converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf):
                 # Adiciona o texto extraído
                 if texto_pagina and texto_pagina.strip():
                     documento_word.add_paragraph(texto_pagina)
-                    print(f"   Página {num_pagina+1}: Texto extraído com sucesso.")
+                    print(f"   Página {num_pagina+1}: Texto extraído com sucesso (confiança média {confianca:.0f}).")
                 else:
                     documento_word.add_paragraph("[AVISO: Nenhum texto reconhecido nesta página, ou página em branco.]")
                     print(f"   Página {num_pagina+1}: Falha na extração de texto (pode ser imagem sem texto ou ilegível).")
                 
             # 4. Salva o documento DOCX do lote
-            documento_word.save(caminho_docx_lote)
-            print(f"✅ LOTE {lote_atual} CONCLUÍDO e salvo em: {os.path.basename(caminho_docx_lote)}")
+            if fluxo_saida is None:
+                documento_word.save(caminho_docx_lote)
+                print(f"✅ LOTE {lote_atual} CONCLUÍDO e salvo em: {os.path.basename(caminho_docx_lote)}")
+            else:
+                # Gera o .docx em memória e o adiciona ao ZIP da saída
+                buffer = io.BytesIO()
+                documento_word.save(buffer)
+                zip_saida.writestr(os.path.basename(caminho_docx_lote), buffer.getvalue())
+                print(f"✅ LOTE {lote_atual} CONCLUÍDO e adicionado ao ZIP como: {os.path.basename(caminho_docx_lote)}")
             
             lote_atual += 1
             
         print("\n====================================================================")
         print(f"CONVERSÃO OCR COMPLETA! Total de {total_paginas} páginas convertidas.")
+        print(f"Páginas reprocessadas em {DPI_ALTO} DPI por baixa confiança: {paginas_reprocessadas} de {total_paginas}.")
+        imprimir_desempenho(total_paginas, time.perf_counter() - inicio)
         print("====================================================================")
+
+        if zip_saida is not None:
+            zip_saida.close()
+        if fluxo_saida is not None:
+            fluxo_saida.flush()
+        return True
     
     except pytesseract.TesseractNotFoundError:
         print("\nERRO FATAL: Tesseract OCR não encontrado. (Verifique o caminho: /opt/homebrew/bin/tesseract)")
+        return False
     except Exception as e:
         print(f"\n❌ ERRO grave durante a conversão: {e}")
         print("Verifique se o Poppler está instalado corretamente (necessário para pdf2image) e no PATH.")
         import traceback
         traceback.print_exc()
+        return False
+    finally:
+        if fechar_saida:
+            fluxo_saida.close()
+        if arquivo_temporario is not None:
+            os.remove(arquivo_temporario.name)
 
 
 # --- EXECUÇÃO PRINCIPAL ---
 if __name__ == "__main__":
     
-    # Obtém o nome do arquivo PDF através da entrada do usuário
-    nome_arquivo_pdf = input("Por favor, digite o NOME COMPLETO do arquivo PDF (ex: relatorio.pdf): ")
+    if len(sys.argv) > 1:
+        # Uso: python ocrconverter.py <arquivo.pdf|-> [saida|-]  ('-' = stdin/stdout)
+        nome_arquivo_pdf = sys.argv[1]
+        saida = sys.argv[2] if len(sys.argv) > 2 else None
+    else:
+        # Obtém o nome do arquivo PDF através da entrada do usuário
+        nome_arquivo_pdf = input("Por favor, digite o NOME COMPLETO do arquivo PDF (ex: relatorio.pdf): ")
+        saida = None
     
-    # Chama a função de conversão
-    converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf)
\ No newline at end of file
+    # Com saída na stdout, as mensagens de progresso vão para a stderr
+    if saida == '-':
+        saida = sys.stdout.buffer
+        with redirect_stdout(sys.stderr):
+            sucesso = converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf, saida)
+    else:
+        # Chama a função de conversão
+        sucesso = converter_pdf_com_ocr_em_lotes(nome_arquivo_pdf, saida)
+
+    # Código de saída diferente de zero para que pipelines detectem a falha
+    sys.exit(0 if sucesso else 1)
\ No newline at end of file
@@ -0,0 +1,58 @@
+import io
+import sys
+from pathlib import Path
+
+try:
+    import resource  # Medição do pico de memória (indisponível no Windows)
+except ImportError:
+    resource = None
+
+
+def resolver_origem_pdf(origem):
+    """
+    Resolve a origem de um PDF: caminho, bytes, objeto de arquivo binário ou '-' (stdin).
+    Retorna (caminho ou None, origem aceita pelo pdfplumber, nome do arquivo).
+    """
+    if origem == '-':
+        return None, io.BytesIO(sys.stdin.buffer.read()), 'stdin.pdf'
+    if isinstance(origem, (bytes, bytearray)):
+        return None, io.BytesIO(origem), 'documento.pdf'
+    if hasattr(origem, 'read'):
+        # pdfplumber precisa de acesso aleatório; streams sem seek são lidos para a memória
+        seekable = getattr(origem, 'seekable', lambda: False)()
+        nome = Path(str(getattr(origem, 'name', 'documento.pdf'))).name
+        return None, origem if seekable else io.BytesIO(origem.read()), nome
+
+    caminho = Path(origem)
+    if not caminho.exists():
+        raise FileNotFoundError(f"Arquivo PDF não encontrado: {origem}")
+    return caminho, caminho, caminho.name
+
+
+def pico_memoria_mb():
+    """
+    Maior uso de memória (RSS) de um único processo: este ou um subprocesso já
+    encerrado. Não é a soma dos processos que rodaram ao mesmo tempo.
+    O ru_maxrss é o pico desde o início do processo, não da conversão: se o
+    processo converter vários documentos, o valor inclui os anteriores.
+    """
+    if resource is None:
+        return None
+    pico = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss vem em bytes no macOS e em KB no Linux
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def imprimir_desempenho(total_paginas, duracao, processos=1):
+    """Imprime vazão e pico de memória no mesmo formato para todos os motores."""
+    print(f"📊 Tempo: {duracao:.1f}s para {total_paginas} páginas ({total_paginas / duracao:.2f} páginas/s).")
+    pico = pico_memoria_mb()
+    if pico is None:
+        return
+    if processos > 1:
+        print(f"📊 Pico de memória por processo desde o início: {pico:.0f} MB (maior entre {processos} processos simultâneos; o total pode chegar a ~{pico * processos:.0f} MB).")
+    else:
+        print(f"📊 Pico de memória do processo desde o início: {pico:.0f} MB.")